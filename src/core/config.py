@@ -3,8 +3,10 @@ Configuration management for the crypto crawler.
 Supports both environment variables and configuration files.
 """
 
+import functools
 import os
 import logging
+import sys
 from dataclasses import dataclass
 from typing import List
 
@@ -22,6 +24,7 @@ class CrawlerConfig:
     # HTTP Client settings
     http_timeout: int = 30
     http_max_retries: int = 5
+    http_cache_ttl: float = 0.0
 
     # Polling settings
     poll_interval: float = 1.0
@@ -30,6 +33,7 @@ class CrawlerConfig:
     # Rate limiting
     html_scraping_delay: float = 0.5
     json_api_delay: float = 0.2
+    max_concurrent_pages: int = 8
 
     # Moving average
     moving_average_window: int = 10
@@ -56,49 +60,67 @@ class CrawlerConfig:
     cmc_pages_per_scrape: int = 5
     cmc_coins_per_page: int = 20
 
+    def __post_init__(self):
+        self._cache_log_level()
+
+    def _cache_log_level(self) -> None:
+        """Resolve the log level name and number once per change"""
+        self._log_level_name = self.log_level.upper()
+        self._level_num = getattr(logging, self._log_level_name, logging.INFO)
+
     @classmethod
     def from_env(cls) -> "CrawlerConfig":
         """Create configuration from environment variables"""
+        # Single mapping lookup target instead of ~20 os.getenv calls
+        env = os.environ
         return cls(
-            http_timeout=int(os.getenv("CRYPTO_HTTP_TIMEOUT", "30")),
-            http_max_retries=int(os.getenv("CRYPTO_HTTP_MAX_RETRIES", "5")),
-            poll_interval=float(os.getenv("CRYPTO_POLL_INTERVAL", "1.0")),
+            http_timeout=int(env.get("CRYPTO_HTTP_TIMEOUT", "30")),
+            http_max_retries=int(env.get("CRYPTO_HTTP_MAX_RETRIES", "5")),
+            http_cache_ttl=float(env.get("CRYPTO_CACHE_TTL", "0.0")),
+            poll_interval=float(env.get("CRYPTO_POLL_INTERVAL", "1.0")),
             max_consecutive_failures=int(
-                os.getenv("CRYPTO_MAX_FAILURES", "5")
+                env.get("CRYPTO_MAX_FAILURES", "5")
+            ),
+            html_scraping_delay=float(env.get("CRYPTO_HTML_DELAY", "0.5")),
+            json_api_delay=float(env.get("CRYPTO_JSON_DELAY", "0.2")),
+            max_concurrent_pages=int(
+                env.get("CRYPTO_MAX_CONCURRENT_PAGES", "8")
             ),
-            html_scraping_delay=float(os.getenv("CRYPTO_HTML_DELAY", "0.5")),
-            json_api_delay=float(os.getenv("CRYPTO_JSON_DELAY", "0.2")),
-            moving_average_window=int(os.getenv("CRYPTO_MA_WINDOW", "10")),
-            storage_type=os.getenv("CRYPTO_STORAGE_TYPE", "csv"),
-            data_directory=os.getenv("CRYPTO_DATA_DIR", "data"),
+            moving_average_window=int(env.get("CRYPTO_MA_WINDOW", "10")),
+            storage_type=env.get("CRYPTO_STORAGE_TYPE", "csv"),
+            data_directory=env.get("CRYPTO_DATA_DIR", "data"),
             requests_per_second=float(
-                os.getenv("CRYPTO_REQUESTS_PER_SECOND", "2.0")
+                env.get("CRYPTO_REQUESTS_PER_SECOND", "2.0")
             ),
-            coingecko_base_url=os.getenv(
+            coingecko_base_url=env.get(
                 "COINGECKO_BASE_URL", "https://api.coingecko.com/api/v3"
             ),
-            coinmarketcap_base_url=os.getenv(
+            coinmarketcap_base_url=env.get(
                 "COINMARKETCAP_BASE_URL", "https://coinmarketcap.com"
             ),
-            coinmarketcap_api_url=os.getenv(
+            coinmarketcap_api_url=env.get(
                 "COINMARKETCAP_API_URL",
                 "https://api.coinmarketcap.com/data-api/v3/"
                 "cryptocurrency/listing"
             ),
-            log_level=os.getenv("CRYPTO_LOG_LEVEL", "INFO"),
-            log_format=os.getenv(
+            log_level=env.get("CRYPTO_LOG_LEVEL", "INFO"),
+            log_format=env.get(
                 "CRYPTO_LOG_FORMAT",
                 "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
             ),
-            cmc_pages_per_scrape=int(os.getenv("CRYPTO_CMC_PAGES", "5")),
-            cmc_coins_per_page=int(os.getenv("CRYPTO_CMC_PER_PAGE", "20")),
+            cmc_pages_per_scrape=int(env.get("CRYPTO_CMC_PAGES", "5")),
+            cmc_coins_per_page=int(env.get("CRYPTO_CMC_PER_PAGE", "20")),
         )
 
     def setup_logging(self) -> None:
         """Configure logging based on settings"""
+        self._cache_log_level()
+        # Single stdout sink: user-facing messages go through the
+        # logger instead of being printed and logged twice
         logging.basicConfig(
-            level=getattr(logging, self.log_level.upper()),
+            level=self._level_num,
             format=self.log_format,
+            stream=sys.stdout,
             force=True,  # Override existing configuration
         )
 
@@ -130,14 +152,15 @@ class CrawlerConfig:
             errors.append("storage_type must be 'csv' or 'sqlite'")
 
         valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if self.log_level.upper() not in valid_levels:
+        if self._log_level_name not in valid_levels:
             errors.append("log_level must be a valid logging level")
 
         return errors
 
 
+@functools.lru_cache(maxsize=1)
 def load_config() -> CrawlerConfig:
-    """Load configuration from environment variables"""
+    """Load configuration from environment variables (cached)"""
     config = CrawlerConfig.from_env()
 
     # Validate configuration
@@ -3,7 +3,7 @@ Interfaces for the crypto crawler exercise.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Union
 from datetime import datetime
 
 
@@ -28,9 +28,9 @@ class IStorage(ABC):
 
     @abstractmethod
     async def store_price(
-        self, symbol: str, price: float, timestamp: datetime
+        self, symbol: str, price: float, timestamp: Union[datetime, str]
     ) -> None:
-        """Store price data"""
+        """Store price data (timestamp as datetime or ISO string)"""
         pass
 
     @abstractmethod
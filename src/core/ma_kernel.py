@@ -0,0 +1,30 @@
+"""
+Compiled rolling-mean kernel for backfilling moving-average state.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _rolling_mean(arr, window):
+    """Rolling mean over arr with the given window size"""
+    out = np.empty(arr.size)
+    total = 0.0
+    for i in range(arr.size):
+        total += arr[i]
+        if i >= window:
+            total -= arr[i - window]
+        out[i] = total / min(i + 1, window)
+    return out
+
+
+if njit is not None:
+    # cache=True persists the compiled kernel across runs, so the
+    # compile cost is only paid once
+    rolling_mean = njit(cache=True)(_rolling_mean)
+else:
+    rolling_mean = _rolling_mean
@@ -6,8 +6,10 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class PriceData:
     """Bitcoin price data"""
 
@@ -23,7 +25,7 @@ class PriceData:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CoinData:
     """Coin listing data from CoinMarketCap"""
 
@@ -35,6 +37,12 @@ class CoinData:
     market_cap: float
     
     def to_dict(self) -> Dict[str, Any]:
+        """Dict projection of the listing row.
+
+        The provider hot loops build these dicts directly and never go
+        through CoinData, so no per-row call frame is paid there; this
+        stays as a convenience for external callers.
+        """
         return {
             "rank": self.rank,
             "name": self.name,
@@ -49,24 +57,62 @@ class CoinData:
 class MovingAverage:
     """Moving average calculator"""
 
+    # Manual __slots__: dataclass slots=True cannot cover the ring-buffer
+    # state assigned in __post_init__
+    __slots__ = ("window_size", "_buf", "_idx", "_count", "_sum")
+
     window_size: int
-    values: List[float]
-    
+
     def __post_init__(self):
-        self.values = []
-    
+        # Preallocated float64 ring buffer plus a running sum: one
+        # contiguous 8-byte slot per sample instead of boxed Python
+        # floats, and O(1) add_value/get_average regardless of window.
+        self._buf = np.empty(self.window_size, dtype=np.float64)
+        self._idx = 0
+        self._count = 0
+        self._sum = 0.0
+
+    @property
+    def values(self) -> List[float]:
+        """Current window contents, oldest first"""
+        if self._count < self.window_size:
+            return self._buf[:self._count].tolist()
+        return np.roll(self._buf, -self._idx).tolist()
+
+    def seed(self, values: np.ndarray,
+             average: Optional[float] = None) -> None:
+        """Refill the window from historical values (oldest first).
+
+        `average` is the precomputed mean of the seeded window (e.g. the
+        last entry of the batched rolling-mean kernel); when given, the
+        running sum is restored from it instead of re-summed in Python.
+        """
+        tail = np.asarray(values, dtype=np.float64)[-self.window_size:]
+        n = int(tail.size)
+        self._buf[:n] = tail
+        self._count = n
+        self._idx = n % self.window_size
+        if average is None:
+            self._sum = float(tail.sum())
+        else:
+            self._sum = average * n
+
     def add_value(self, value: float) -> None:
         """Add a new value and maintain window size"""
-        self.values.append(value)
-        if len(self.values) > self.window_size:
-            self.values.pop(0)
-    
+        if self._count == self.window_size:
+            self._sum -= self._buf[self._idx]
+        else:
+            self._count += 1
+        self._buf[self._idx] = value
+        self._sum += value
+        self._idx = (self._idx + 1) % self.window_size
+
     def get_average(self) -> Optional[float]:
         """Calculate moving average"""
-        if not self.values:
+        if self._count == 0:
             return None
-        return sum(self.values) / len(self.values)
-    
+        return self._sum / self._count
+
     def is_ready(self) -> bool:
         """Check if we have enough values for a meaningful average"""
-        return len(self.values) >= self.window_size 
+        return self._count >= self.window_size
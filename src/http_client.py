@@ -5,8 +5,15 @@ HTTP client for the crypto crawler exercise.
 import aiohttp
 import asyncio
 import logging
+import random
 from typing import Dict, Any, Optional
-from datetime import datetime
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
 
 from .core.interfaces import IHttpClient
 
@@ -18,7 +25,9 @@ class HttpClient(IHttpClient):
         self,
         timeout: int = 30,
         max_retries: int = 5,
-        requests_per_second: float = 2.0
+        requests_per_second: float = 2.0,
+        max_concurrent: int = 8,
+        cache_ttl: float = 0.0
     ):
         self.timeout = timeout
         self.max_retries = max_retries
@@ -26,48 +35,141 @@ class HttpClient(IHttpClient):
         self.session: Optional[aiohttp.ClientSession] = None
         self.logger = logging.getLogger(__name__)
 
-        self.last_request_time: Optional[datetime] = None
-        self.min_interval = (
-            1.0 / requests_per_second if requests_per_second > 0 else 0
-        )
+        # Response cache, disabled unless a TTL is configured (the 1 Hz
+        # price poller must not be served stale prices by default).
+        # Maps url -> (expiry on the loop clock, parsed body, etag).
+        self.cache_ttl = cache_ttl
+        self._cache: Dict[str, Any] = {}
+
+        # Token bucket shared by all concurrent requests: the semaphore
+        # bounds in-flight requests while the bucket spaces them globally
+        self._sem = asyncio.Semaphore(max_concurrent)
+        self._bucket_lock = asyncio.Lock()
+        self._tokens = 1.0
+        self._last_refill: Optional[float] = None
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create HTTP session"""
         if self.session is None or self.session.closed:
+            # Persistent pooled connector: keep-alive skips the TLS
+            # handshake on repeat requests and the DNS cache avoids
+            # re-resolving the same hosts on every scrape
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=10,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True,
+            )
             self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"Accept-Encoding": "gzip, deflate"},
             )
         return self.session
 
     async def _rate_limit(self) -> None:
-        """Apply rate limiting"""
-        if self.last_request_time is not None and self.min_interval > 0:
-            elapsed = (datetime.now() - self.last_request_time).total_seconds()
-            if elapsed < self.min_interval:
-                sleep_time = self.min_interval - elapsed
-                self.logger.debug(f"Rate limiting: sleeping {sleep_time:.2f}s")
+        """Take one token from the shared bucket, waiting if necessary"""
+        if self.requests_per_second <= 0:
+            return
+
+        # Monotonic loop clock: a plain float, immune to wall-clock jumps
+        loop = asyncio.get_running_loop()
+        async with self._bucket_lock:
+            now = loop.time()
+            if self._last_refill is None:
+                self._last_refill = now
+            refill = (now - self._last_refill) * self.requests_per_second
+            self._tokens = min(1.0, self._tokens + refill)
+            self._last_refill = now
+
+            if self._tokens < 1.0:
+                sleep_time = (1.0 - self._tokens) / self.requests_per_second
+                self.logger.debug("Rate limiting: sleeping %.2fs", sleep_time)
                 await asyncio.sleep(sleep_time)
+                self._last_refill = loop.time()
+                self._tokens = 1.0
+
+            self._tokens -= 1.0
 
-        self.last_request_time = datetime.now()
+    def _retry_delay(self, response, attempt: int) -> float:
+        """Backoff delay for a retryable response, honoring Retry-After"""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), 30.0)
+            except ValueError:
+                pass  # HTTP-date form; fall through to jittered backoff
+
+        # Jitter decorrelates retries so concurrent clients don't all
+        # hit the server again at the same deterministic instants
+        return random.uniform(0, min(30.0, float(2**attempt)))
 
     async def get(self, url: str, **kwargs) -> Dict[str, Any]:
         """Make GET request with rate limiting and exponential backoff retry"""
+        if self.cache_ttl > 0:
+            entry = self._cache.get(url)
+            if entry is not None:
+                expires, data, etag = entry
+                if asyncio.get_running_loop().time() < expires:
+                    self.logger.debug("Cache hit for %s", url)
+                    return data
+                if etag:
+                    # Stale entry: revalidate so a 304 can short-circuit
+                    headers = dict(kwargs.get("headers") or {})
+                    headers["If-None-Match"] = etag
+                    kwargs["headers"] = headers
+
+        async with self._sem:
+            return await self._get(url, **kwargs)
+
+    async def get_bytes(self, url: str, **kwargs) -> bytes:
+        """GET raw response bytes (for HTML scraping).
+
+        Goes through the same concurrency cap and token bucket as get(),
+        so HTML page fetches are spaced like every other request instead
+        of bypassing the rate limiter.
+        """
+        async with self._sem:
+            await self._rate_limit()
+            session = await self._get_session()
+            async with session.get(url, **kwargs) as response:
+                response.raise_for_status()
+                return await response.read()
+
+    def _cache_store(self, url: str, data: Dict[str, Any], etag) -> None:
+        """Remember a parsed response for cache_ttl seconds"""
+        if len(self._cache) >= 1024:
+            # Evict the oldest entry (insertion order) to bound memory
+            self._cache.pop(next(iter(self._cache)))
+        expires = asyncio.get_running_loop().time() + self.cache_ttl
+        self._cache[url] = (expires, data, etag)
+
+    async def _get(self, url: str, **kwargs) -> Dict[str, Any]:
+        """Perform the actual request; caller holds the concurrency slot"""
         await self._rate_limit()
         session = await self._get_session()
 
         for attempt in range(self.max_retries):
             try:
                 self.logger.debug(
-                    f"Making request to {url} (attempt {attempt + 1})"
+                    "Making request to %s (attempt %d)", url, attempt + 1
                 )
 
                 async with session.get(url, **kwargs) as response:
-                    if response.status >= 500:
+                    if response.status == 304 and url in self._cache:
+                        # Upstream confirms our copy is still valid
+                        _, data, etag = self._cache[url]
+                        self._cache_store(url, data, etag)
+                        self.logger.debug("Revalidated cache for %s", url)
+                        return data
+
+                    if response.status >= 500 or response.status == 429:
                         if attempt < self.max_retries - 1:
-                            delay = 2**attempt
+                            delay = self._retry_delay(response, attempt)
                             self.logger.warning(
-                                f"Server error {response.status}, "
-                                f"retrying in {delay}s"
+                                "Server error %d, retrying in %.1fs",
+                                response.status,
+                                delay,
                             )
                             await asyncio.sleep(delay)
                             continue
@@ -91,8 +193,13 @@ class HttpClient(IHttpClient):
                             message=error_msg,
                         )
 
-                    data = await response.json()
-                    self.logger.debug(f"Successfully fetched data from {url}")
+                    body = await response.read()
+                    data = _json_loads(body)
+                    if self.cache_ttl > 0:
+                        self._cache_store(
+                            url, data, response.headers.get("ETag")
+                        )
+                    self.logger.debug("Successfully fetched data from %s", url)
                     return data
 
             except aiohttp.ClientResponseError:
@@ -102,14 +209,15 @@ class HttpClient(IHttpClient):
                 if attempt < self.max_retries - 1:
                     delay = 2**attempt
                     self.logger.warning(
-                        f"Request failed: {e}, retrying in {delay}s"
+                        "Request failed: %s, retrying in %ds", e, delay
                     )
                     await asyncio.sleep(delay)
                     continue
                 else:
                     self.logger.error(
-                        f"Request failed after {self.max_retries} "
-                        f"attempts: {e}"
+                        "Request failed after %d attempts: %s",
+                        self.max_retries,
+                        e,
                     )
                     raise e
 
@@ -2,14 +2,121 @@
 Providers for the crypto crawler exercise.
 """
 
+import asyncio
+import os
 import re
-import jmespath
-from typing import Dict, Any, List
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
+from selectolax.parser import HTMLParser
 
 from .core.interfaces import IDataProvider
 from .http_client import HttpClient
 
+# Compiled once; the scraping loop applies these to every table row
+_RANK_RE = re.compile(r"\d+")
+_NUM_RE = re.compile(r"[^\d.]")
+_SIGNED_NUM_RE = re.compile(r"[^\d.-]")
+
+# Selector and class-name constants shared by every page parse
+_ROW_SELECTOR = "tr.cmc-table-row"
+_SYMBOL_CLASS = "coin-item-symbol"
+_NAME_CLASS = "sc-4984dd93-0"
+_PRICE_CLASS = "sc-b3fc6b7-0"
+
+
+def _extract_row_fields(row):
+    """Collect the symbol/name/price/change nodes in one subtree pass
+
+    Replaces four separate css_first/css scans per row, each of which
+    walks the whole row subtree again.
+    """
+    symbol_elem = name_elem = price_elem = change_elem = None
+    for node in row.traverse(include_text=False):
+        tag = node.tag
+        if tag == "p":
+            classes = node.attributes.get("class") or ""
+            if symbol_elem is None and _SYMBOL_CLASS in classes:
+                symbol_elem = node
+            elif name_elem is None and _NAME_CLASS in classes:
+                name_elem = node
+        elif tag == "div":
+            classes = node.attributes.get("class") or ""
+            if price_elem is None and _PRICE_CLASS in classes:
+                price_elem = node
+        elif tag == "span":
+            if change_elem is None and "%" in node.text():
+                change_elem = node
+    return symbol_elem, name_elem, price_elem, change_elem
+
+
+def _parse_listings_html(body: bytes) -> List[Dict[str, Any]]:
+    """Parse one CoinMarketCap listings page into coin dicts.
+
+    Module-level (picklable) so it can run in a worker process: parsing
+    is CPU-bound and holds the GIL, so doing it on the event loop would
+    serialize concurrent page parses.
+    """
+    # The coin table lives inside <tbody>; parsing just that slice
+    # spares the C parser the page chrome around it. Re-wrap it in a
+    # <table> so the rows keep their table parsing context.
+    start = body.find(b"<tbody")
+    if start != -1:
+        end = body.find(b"</tbody>", start)
+        if end != -1:
+            fragment = body[start:end + len(b"</tbody>")]
+            body = b"<table>" + fragment + b"</table>"
+
+    tree = HTMLParser(body)
+    listings = []
+
+    # Find the crypto table rows
+    rows = tree.css(_ROW_SELECTOR)
+
+    for row in rows:
+        try:
+            (
+                symbol_elem,
+                name_elem,
+                price_elem,
+                change_elem,
+            ) = _extract_row_fields(row)
+            if not symbol_elem:
+                continue
+
+            rank_match = _RANK_RE.search(symbol_elem.text())
+            if not rank_match:
+                continue
+            rank = int(rank_match.group())
+
+            if name_elem and symbol_elem and price_elem:
+                name = name_elem.text().strip()
+                symbol = symbol_elem.text().strip()
+                price_text = price_elem.text().strip()
+                price = float(_NUM_RE.sub("", price_text))
+
+                change_24h = 0.0
+                if change_elem:
+                    change_text = change_elem.text().strip()
+                    change_24h = float(_SIGNED_NUM_RE.sub("", change_text))
+
+                # Market cap extraction (simplified)
+                market_cap = price * 1000000  # Placeholder calculation
+
+                listings.append(
+                    {
+                        "rank": rank,
+                        "name": name,
+                        "symbol": symbol,
+                        "price": price,
+                        "change_24h": change_24h,
+                        "market_cap": market_cap,
+                    }
+                )
+        except Exception:
+            continue  # Skip malformed rows
+
+    return listings
+
 
 class CoinGeckoProvider(IDataProvider):
     """CoinGecko provider for Bitcoin price polling"""
@@ -21,16 +128,25 @@ class CoinGeckoProvider(IDataProvider):
         else:
             self.base_url = "https://api.coingecko.com/api/v3"
 
-    async def get_price(self, symbol: str = "bitcoin") -> Dict[str, Any]:
-        """Get current Bitcoin price from CoinGecko"""
-        url = (
-            f"{self.base_url}/simple/price?ids={symbol}"
+        # URL template built once; the poller hits the same endpoint on
+        # every tick, so the common bitcoin URL is fully precomputed
+        self._price_url_tmpl = (
+            f"{self.base_url}/simple/price?ids={{symbol}}"
             "&vs_currencies=usd&include_last_updated_at=true"
         )
+        self._btc_url = self._price_url_tmpl.format(symbol="bitcoin")
+
+    async def get_price(self, symbol: str = "bitcoin") -> Dict[str, Any]:
+        """Get current Bitcoin price from CoinGecko"""
+        if symbol == "bitcoin":
+            url = self._btc_url
+        else:
+            url = self._price_url_tmpl.format(symbol=symbol)
         data = await self.http_client.get(url)
 
-        price = jmespath.search(f"{symbol}.usd", data)
-        last_updated = jmespath.search(f"{symbol}.last_updated_at", data)
+        coin = data.get(symbol) or {}
+        price = coin.get("usd")
+        last_updated = coin.get("last_updated_at")
 
         if price is None:
             raise ValueError(f"Price data not found for {symbol}")
@@ -58,6 +174,13 @@ class CoinMarketCapProvider(IDataProvider):
                 "cryptocurrency/listing"
             )
 
+        self._list_url_tmpl = (
+            f"{self.api_url}?start={{start}}&limit={{limit}}"
+            "&sortBy=market_cap&sortType=desc&convert=USD"
+        )
+        # Created on first HTML parse; JSON-only runs never pay for it
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+
     async def get_price(self, symbol: str) -> Dict[str, Any]:
         return {}
 
@@ -66,38 +189,46 @@ class CoinMarketCapProvider(IDataProvider):
     ) -> List[Dict[str, Any]]:
         """Get coin listings from CoinMarketCap (JSON API method)"""
         start = (page - 1) * limit + 1
-        url = (
-            f"{self.api_url}?start={start}&limit={limit}"
-            "&sortBy=market_cap&sortType=desc&convert=USD"
-        )
+        url = self._list_url_tmpl.format(start=start, limit=limit)
 
         data = await self.http_client.get(url)
-        listings = []
 
-        crypto_list = jmespath.search("data.cryptoCurrencyList", data) or []
+        crypto_list = (data.get("data") or {}).get("cryptoCurrencyList") or []
 
-        for item in crypto_list:
-            # Extract data using JMESPath expressions for better error handling
-            rank = jmespath.search("cmcRank", item)
-            name = jmespath.search("name", item)
-            symbol = jmespath.search("symbol", item)
-            price = jmespath.search("quotes[0].price", item)
-            change_24h = jmespath.search("quotes[0].percentChange24h", item)
-            market_cap = jmespath.search("quotes[0].marketCap", item)
-
-            # Only add if we have the essential data
-            if all(x is not None for x in [rank, name, symbol, price]):
-                listings.append(
-                    {
-                        "rank": rank,
-                        "name": name,
-                        "symbol": symbol,
-                        "price": price,
-                        "change_24h": change_24h or 0.0,
-                        "market_cap": market_cap or 0.0,
-                    }
-                )
+        # Preallocate the output: one slot per candidate row, trimmed at
+        # the end, instead of growing the list with repeated appends
+        listings: List[Dict[str, Any]] = [None] * len(crypto_list)
+        count = 0
 
+        for item in crypto_list:
+            # Plain dict access; missing fields simply come back as None
+            rank = item.get("cmcRank")
+            name = item.get("name")
+            symbol = item.get("symbol")
+            quote = (item.get("quotes") or [{}])[0]
+            price = quote.get("price")
+            change_24h = quote.get("percentChange24h")
+            market_cap = quote.get("marketCap")
+
+            # Only add if we have the essential data; the plain and-chain
+            # short-circuits without building a list and generator per row
+            if (
+                rank is not None
+                and name is not None
+                and symbol is not None
+                and price is not None
+            ):
+                listings[count] = {
+                    "rank": rank,
+                    "name": name,
+                    "symbol": symbol,
+                    "price": price,
+                    "change_24h": change_24h or 0.0,
+                    "market_cap": market_cap or 0.0,
+                }
+                count += 1
+
+        del listings[count:]
         return listings
 
     async def get_listings_html(self, page: int = 1) -> List[Dict[str, Any]]:
@@ -107,58 +238,27 @@ class CoinMarketCapProvider(IDataProvider):
         else:
             url = f"{self.base_url}/"
 
-        # For HTML scraping, we need to get the raw HTML, not JSON
-        session = await self.http_client._get_session()
-        async with session.get(url) as response:
-            html = await response.text()
-
-        soup = BeautifulSoup(html, "html.parser")
-        listings = []
-
-        # Find the crypto table rows
-        rows = soup.find_all("tr", class_="cmc-table-row")
-
-        for row in rows:
-            try:
-                rank_elem = row.find("p", class_="coin-item-symbol")
-                if not rank_elem:
-                    continue
-
-                rank_match = re.search(r"\d+", rank_elem.get_text())
-                if not rank_match:
-                    continue
-                rank = int(rank_match.group())
-
-                name_elem = row.find("p", class_="sc-4984dd93-0")
-                symbol_elem = row.find("p", class_="coin-item-symbol")
-                price_elem = row.find("div", class_="sc-b3fc6b7-0")
-                change_elem = row.find("span", string=re.compile(r"%"))
-
-                if all([name_elem, symbol_elem, price_elem]):
-                    name = name_elem.get_text().strip()
-                    symbol = symbol_elem.get_text().strip()
-                    price_text = price_elem.get_text().strip()
-                    price = float(re.sub(r"[^\d.]", "", price_text))
-
-                    change_24h = 0.0
-                    if change_elem:
-                        change_text = change_elem.get_text().strip()
-                        change_24h = float(re.sub(r"[^\d.-]", "", change_text))
-
-                    # Market cap extraction (simplified)
-                    market_cap = price * 1000000  # Placeholder calculation
-
-                    listings.append(
-                        {
-                            "rank": rank,
-                            "name": name,
-                            "symbol": symbol,
-                            "price": price,
-                            "change_24h": change_24h,
-                            "market_cap": market_cap,
-                        }
-                    )
-            except Exception:
-                continue  # Skip malformed rows
+        # For HTML scraping, we need the raw HTML, not JSON. Keep it as
+        # bytes: selectolax parses bytes directly, skipping a str decode.
+        # The session's default Accept-Encoding (gzip, deflate) applies;
+        # advertising br would need the optional Brotli package installed
+        # for aiohttp to decode the response.
+        body = await self.http_client.get_bytes(url)
+
+        # Parse off the event loop: page k+1 can be fetched while page k
+        # is parsed, and parses spread across cores instead of queueing
+        # behind the GIL
+        if self._parse_pool is None:
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count()
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._parse_pool, _parse_listings_html, body
+        )
 
-        return listings
+    def close(self) -> None:
+        """Release the parse worker pool, if one was started"""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
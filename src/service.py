@@ -4,10 +4,14 @@ Service for the crypto crawler exercise.
 
 import asyncio
 import logging
+import random
 import signal
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
+import numpy as np
+
+from .core.ma_kernel import rolling_mean
 from .core.models import PriceData, MovingAverage
 from .core.interfaces import IStorage
 from .core.config import CrawlerConfig, load_config
@@ -30,33 +34,116 @@ class CryptoCrawlerService:
             timeout=config.http_timeout,
             max_retries=config.http_max_retries,
             requests_per_second=config.requests_per_second,
+            cache_ttl=config.http_cache_ttl,
         )
         self.coingecko = CoinGeckoProvider(self.http_client, config)
         self.coinmarketcap = CoinMarketCapProvider(self.http_client, config)
         self.moving_average = MovingAverage(
-            window_size=config.moving_average_window, values=[]
+            window_size=config.moving_average_window
         )
-        self.running = False
+        # Created in start_price_poller once a loop is running
+        self._stop_event: Optional[asyncio.Event] = None
+        # In-flight background store_price tasks (see _store_price_bg)
+        self._pending_stores: set = set()
+        self._store_slots = asyncio.Semaphore(16)
         self.consecutive_failures = 0
         self.logger = logging.getLogger(__name__)
 
-    async def start_price_poller(self) -> None:
-        """Start Phase 1: Bitcoin price polling with moving average"""
-        self.logger.info("Starting Bitcoin price poller...")
-        print("Starting Bitcoin price poller...")
-        print("Press Ctrl-C to stop")
-
-        self.running = True
+    async def _warm_moving_average(self) -> None:
+        """Seed the moving average window from previously stored prices"""
+        window = self.config.moving_average_window
+        try:
+            recent = await self.storage.get_recent_prices("BTC", window)
+        except Exception as e:
+            self.logger.debug("Could not warm moving average: %s", e)
+            return
+
+        if not recent:
+            return
+
+        # Rows arrive oldest-first; the compiled kernel produces the
+        # rolling mean in one pass and its final entry seeds the window
+        prices = np.array([r["price"] for r in recent], dtype=np.float64)
+        warm_sma = float(rolling_mean(prices, window)[-1])
+        self.moving_average.seed(prices, warm_sma)
+        self.logger.info(
+            "Warmed moving average from %d stored prices (SMA $%.2f)",
+            prices.size,
+            warm_sma,
+        )
 
-        # Setup signal handler for graceful shutdown
-        def signal_handler(signum, frame):
-            self.logger.info("Shutdown signal received")
-            print("\nShutting down...")
-            self.running = False
+    def _store_price_bg(self, symbol: str, price: float,
+                        timestamp: str) -> None:
+        """Store a price in a background task instead of awaiting it.
+
+        The disk write then overlaps the next iteration's network fetch.
+        The semaphore bounds how many writes can be in flight; pending
+        tasks are drained on shutdown.
+        """
+        async def store() -> None:
+            async with self._store_slots:
+                try:
+                    await self.storage.store_price(symbol, price, timestamp)
+                except Exception as e:
+                    self.logger.error("Failed to store price: %s", e)
+
+        task = asyncio.create_task(store())
+        self._pending_stores.add(task)
+        task.add_done_callback(self._pending_stores.discard)
+
+    def _request_stop(self) -> None:
+        """Ask the poller to stop; invoked from the SIGINT handler"""
+        self.logger.info("Shutting down...")
+        self._stop_event.set()
+
+    async def _sleep_or_stop(self, delay: float) -> None:
+        """Sleep up to delay seconds, waking immediately on shutdown"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def _failure_backoff(self, error: Exception) -> float:
+        """Backoff before the next poll attempt after a failure.
+
+        Uses the server's Retry-After when the failure carries response
+        headers (429 and friends); otherwise full-jitter exponential
+        backoff, so repeated retries don't land at deterministic times.
+        """
+        headers = getattr(error, "headers", None)
+        retry_after = headers.get("Retry-After") if headers else None
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), 30.0)
+            except ValueError:
+                pass
 
-        signal.signal(signal.SIGINT, signal_handler)
+        cap = min(2 ** (self.consecutive_failures - 1), 30)
+        return random.uniform(0, cap)
 
-        while self.running:
+    async def start_price_poller(self) -> None:
+        """Start Phase 1: Bitcoin price polling with moving average"""
+        self.logger.info("Starting Bitcoin price poller...")
+        self.logger.info("Press Ctrl-C to stop")
+
+        await self._warm_moving_average()
+
+        self._stop_event = asyncio.Event()
+
+        # Loop-native SIGINT handling: the stop event wakes the poller
+        # out of its sleep instead of waiting for the interval to expire
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, self._request_stop)
+            handler_installed = True
+        except NotImplementedError:
+            # Platforms without loop signal handlers (e.g. Windows)
+            signal.signal(
+                signal.SIGINT, lambda signum, frame: self._request_stop()
+            )
+            handler_installed = False
+
+        while not self._stop_event.is_set():
             try:
                 # Fetch Bitcoin price
                 price_data = await self.coingecko.get_price("bitcoin")
@@ -69,9 +156,10 @@ class CryptoCrawlerService:
                     timestamp=timestamp
                 )
 
-                # Store price
-                await self.storage.store_price(
-                    btc_price.symbol, btc_price.price, btc_price.timestamp
+                # Store price off the critical path; stringify the
+                # timestamp once here instead of again inside storage
+                self._store_price_bg(
+                    btc_price.symbol, btc_price.price, timestamp.isoformat()
                 )
 
                 # Update moving average
@@ -83,20 +171,20 @@ class CryptoCrawlerService:
                     sma = self.moving_average.get_average()
                     output += f" SMA(10): ${sma:,.2f}"
 
-                print(output)
-                self.logger.debug(f"Bitcoin price: ${btc_price.price:,.2f}")
+                self.logger.info("%s", output)
 
                 # Reset failure counter on success
                 self.consecutive_failures = 0
 
                 # Wait configured interval before the next poll
-                await asyncio.sleep(self.config.poll_interval)
+                await self._sleep_or_stop(self.config.poll_interval)
 
             except Exception as e:
                 self.consecutive_failures += 1
                 self.logger.warning(
-                    f"Price fetch failed "
-                    f"(attempt {self.consecutive_failures}): {e}"
+                    "Price fetch failed (attempt %d): %s",
+                    self.consecutive_failures,
+                    e,
                 )
 
                 if (
@@ -108,76 +196,99 @@ class CryptoCrawlerService:
                         f"consecutive failures. Last error: {e}"
                     )
                     self.logger.error(error_msg)
-                    print(error_msg)
-                    print("Stopping price poller due to repeated failures.")
-                    self.running = False
+                    self.logger.error(
+                        "Stopping price poller due to repeated failures."
+                    )
+                    self._stop_event.set()
                     break
 
-                # Wait before retry with exponential backoff
-                wait_time = min(2 ** (self.consecutive_failures - 1), 30)
-                self.logger.info(f"Waiting {wait_time}s before retry...")
-                await asyncio.sleep(wait_time)
+                # Wait before retry, honoring upstream throttling hints
+                wait_time = self._failure_backoff(e)
+                self.logger.info("Waiting %.1fs before retry...", wait_time)
+                await self._sleep_or_stop(wait_time)
+
+        if handler_installed:
+            loop.remove_signal_handler(signal.SIGINT)
+
+        # Let any in-flight price writes finish before tearing down
+        if self._pending_stores:
+            await asyncio.gather(
+                *self._pending_stores, return_exceptions=True
+            )
 
         await self.http_client.close()
         self.logger.info("Price poller stopped")
-        print("Price poller stopped.")
 
     async def crawl_coinmarketcap_html(
         self, pages: int = 5
     ) -> List[Dict[str, Any]]:
         """Phase 2.1: Scrape CoinMarketCap using HTML parsing"""
-        self.logger.info(f"Starting HTML scraping for {pages} pages")
-        print(f"Scraping CoinMarketCap HTML (pages 1-{pages})...")
+        self.logger.info(
+            "Scraping CoinMarketCap HTML (pages 1-%d)...", pages
+        )
+
+        # Fetch all pages concurrently; request spacing is enforced
+        # centrally by the HttpClient rate limiter
+        sem = asyncio.Semaphore(self.config.max_concurrent_pages)
+
+        async def fetch_page(page: int) -> List[Dict[str, Any]]:
+            async with sem:
+                self.logger.debug("Scraping HTML page %d", page)
+                return await self.coinmarketcap.get_listings_html(page)
+
+        results = await asyncio.gather(
+            *(fetch_page(p) for p in range(1, pages + 1)),
+            return_exceptions=True,
+        )
 
         all_listings = []
-        for page in range(1, pages + 1):
-            self.logger.debug(f"Scraping HTML page {page}")
-            print(f"Scraping page {page}...")
-            try:
-                listings = await self.coinmarketcap.get_listings_html(page)
-                all_listings.extend(listings)
-                # Be nice to the server
-                await asyncio.sleep(self.config.html_scraping_delay)
-            except Exception as e:
-                error_msg = f"Error scraping page {page}: {e}"
-                self.logger.error(error_msg)
-                print(error_msg)
+        for page, result in enumerate(results, start=1):
+            if isinstance(result, BaseException):
+                self.logger.error(
+                    "Error scraping page %d: %s", page, result
+                )
+            else:
+                all_listings.extend(result)
 
         # Store results
         await self.storage.store_listings(all_listings)
-        result_msg = f"Scraped {len(all_listings)} coins via HTML"
-        self.logger.info(result_msg)
-        print(result_msg)
+        self.logger.info("Scraped %d coins via HTML", len(all_listings))
         return all_listings
 
     async def crawl_coinmarketcap_json(
         self, pages: int = 5, per_page: int = 20
     ) -> List[Dict[str, Any]]:
         """Phase 2.2: Scrape CoinMarketCap using JSON API"""
-        self.logger.info(f"Starting JSON API scraping for {pages} pages")
-        print(f"Scraping CoinMarketCap JSON API (pages 1-{pages})...")
+        self.logger.info(
+            "Scraping CoinMarketCap JSON API (pages 1-%d)...", pages
+        )
+
+        sem = asyncio.Semaphore(self.config.max_concurrent_pages)
+
+        async def fetch_page(page: int) -> List[Dict[str, Any]]:
+            async with sem:
+                self.logger.debug("Fetching JSON page %d", page)
+                return await self.coinmarketcap.get_listings(page, per_page)
+
+        results = await asyncio.gather(
+            *(fetch_page(p) for p in range(1, pages + 1)),
+            return_exceptions=True,
+        )
 
         all_listings = []
-        for page in range(1, pages + 1):
-            self.logger.debug(f"Fetching JSON page {page}")
-            print(f"Fetching page {page}...")
-            try:
-                listings = await self.coinmarketcap.get_listings(
-                    page, per_page
+        for page, result in enumerate(results, start=1):
+            if isinstance(result, BaseException):
+                self.logger.error(
+                    "Error fetching page %d: %s", page, result
                 )
-                all_listings.extend(listings)
-                # Faster with JSON API
-                await asyncio.sleep(self.config.json_api_delay)
-            except Exception as e:
-                error_msg = f"Error fetching page {page}: {e}"
-                self.logger.error(error_msg)
-                print(error_msg)
+            else:
+                all_listings.extend(result)
 
         # Store results
         await self.storage.store_listings(all_listings)
-        result_msg = f"Scraped {len(all_listings)} coins via JSON API"
-        self.logger.info(result_msg)
-        print(result_msg)
+        self.logger.info(
+            "Scraped %d coins via JSON API", len(all_listings)
+        )
         return all_listings
 
     async def compare_methods(self) -> Dict[str, Any]:
@@ -241,3 +352,7 @@ class CryptoCrawlerService:
     async def close(self):
         """Cleanup resources"""
         await self.http_client.close()
+        self.coinmarketcap.close()
+        close_storage = getattr(self.storage, "close", None)
+        if close_storage is not None:
+            close_storage()